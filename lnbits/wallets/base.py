@@ -3,9 +3,17 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING, AsyncGenerator, Coroutine, NamedTuple, Optional
 
+import httpx
+
 if TYPE_CHECKING:
     from lnbits.nodes.base import Node
 
+# httpx's default pool sizes, but idle connections are kept for 60s instead
+# of 5s so payments spaced a few seconds apart reuse a warm connection
+HTTP_CLIENT_LIMITS = httpx.Limits(
+    max_keepalive_connections=20, max_connections=100, keepalive_expiry=60
+)
+
 
 class StatusResponse(NamedTuple):
     error_message: Optional[str]
@@ -1,5 +1,6 @@
 import asyncio
 import json
+import re
 from typing import AsyncGenerator, Dict, Optional
 
 import httpx
@@ -8,6 +9,7 @@ from loguru import logger
 from lnbits.settings import settings
 
 from .base import (
+    HTTP_CLIENT_LIMITS,
     InvoiceResponse,
     PaymentFailedStatus,
     PaymentPendingStatus,
@@ -18,6 +20,10 @@ from .base import (
     Wallet,
 )
 
+# SSE lines may end in CRLF, LF or a lone CR. A CR at the very end of the
+# buffer is left unmatched until we know whether an LF follows it.
+SSE_LINE_END = re.compile(rb"\r\n|\r(?!\Z)|\n")
+
 
 class LNbitsWallet(Wallet):
     """https://github.com/lnbits/lnbits"""
@@ -37,7 +43,9 @@ class LNbitsWallet(Wallet):
             )
         self.endpoint = self.normalize_endpoint(settings.lnbits_endpoint)
         self.headers = {"X-Api-Key": key, "User-Agent": settings.user_agent}
-        self.client = httpx.AsyncClient(base_url=self.endpoint, headers=self.headers)
+        self.client = httpx.AsyncClient(
+            base_url=self.endpoint, headers=self.headers, limits=HTTP_CLIENT_LIMITS
+        )
 
     async def cleanup(self):
         try:
@@ -55,7 +63,8 @@ class LNbitsWallet(Wallet):
                 return StatusResponse("no data", 0)
 
             if r.is_error or "balance" not in data:
-                return StatusResponse(f"Server error: '{r.text}'", 0)
+                body = r.content[:250].decode("utf-8", errors="replace")
+                return StatusResponse(f"Server error: '{body}'", 0)
 
             return StatusResponse(None, data["balance"])
         except json.JSONDecodeError:
@@ -196,38 +205,74 @@ class LNbitsWallet(Wallet):
             return PaymentPendingStatus()
 
     async def paid_invoices_stream(self) -> AsyncGenerator[str, None]:
-        url = f"{self.endpoint}/api/v1/payments/sse"
+        url = "/api/v1/payments/sse"
+        retry_delay = 1
 
         while settings.lnbits_running:
             try:
-                async with httpx.AsyncClient(
-                    timeout=None, headers=self.headers
-                ) as client:
-                    del client.headers[
-                        "accept-encoding"
-                    ]  # we have to disable compression for SSEs
-                    async with client.stream(
-                        "GET", url, content="text/event-stream"
-                    ) as r:
-                        sse_trigger = False
-                        async for line in r.aiter_lines():
+                # we have to disable compression for SSEs
+                async with self.client.stream(
+                    "GET",
+                    url,
+                    headers={"accept-encoding": "identity"},
+                    content="text/event-stream",
+                    timeout=None,
+                ) as r:
+                    r.raise_for_status()
+                    sse_trigger = False
+                    # a trailing line without a line ending is dropped when the
+                    # stream ends, unlike with aiter_lines()
+                    buffer = bytearray()
+                    async for chunk in r.aiter_bytes():
+                        # a CR left at the end of the buffer may be the first
+                        # half of a CRLF split across chunks, so rescan it
+                        search = max(len(buffer) - 1, 0)
+                        buffer += chunk
+                        start = 0
+                        for line_end in SSE_LINE_END.finditer(buffer, search):
                             # The data we want to listen to is of this shape:
                             # event: payment-received
                             # data: {.., "payment_hash" : "asd"}
-                            if line.startswith("event: payment-received"):
+                            line = buffer[start : line_end.start()]
+                            start = line_end.end()
+                            if line.startswith(b"event: payment-received"):
                                 sse_trigger = True
-                                continue
-                            elif sse_trigger and line.startswith("data:"):
-                                data = json.loads(line[len("data:") :])
+                            elif sse_trigger and line.startswith(b"data:"):
                                 sse_trigger = False
-                                yield data["payment_hash"]
+                                try:
+                                    data = json.loads(line[len(b"data:") :])
+                                    payment_hash = data["payment_hash"]
+                                except (
+                                    json.JSONDecodeError,
+                                    UnicodeDecodeError,
+                                    KeyError,
+                                    TypeError,
+                                ):
+                                    logger.warning(
+                                        "skipping invalid lnbits /payments/sse data: "
+                                        f"{bytes(line[:200])!r}"
+                                    )
+                                    continue
+                                yield payment_hash
                             else:
                                 sse_trigger = False
-
-            except (OSError, httpx.ReadError, httpx.ConnectError, httpx.ReadTimeout):
+                        if start:
+                            # only a stream that delivers lines counts as recovered
+                            retry_delay = 1
+                        del buffer[:start]
+
+            except (
+                OSError,
+                httpx.ReadError,
+                httpx.ConnectError,
+                httpx.ReadTimeout,
+                httpx.HTTPStatusError,
+            ):
                 pass
 
             logger.error(
-                "lost connection to lnbits /payments/sse, retrying in 5 seconds"
+                "lost connection to lnbits /payments/sse, "
+                f"retrying in {retry_delay} seconds"
             )
-            await asyncio.sleep(5)
+            await asyncio.sleep(retry_delay)
+            retry_delay = min(retry_delay * 2, 30)
@@ -8,6 +8,7 @@ from loguru import logger
 from lnbits.settings import settings
 
 from .base import (
+    HTTP_CLIENT_LIMITS,
     InvoiceResponse,
     PaymentPendingStatus,
     PaymentResponse,
@@ -42,7 +43,10 @@ class LNPayWallet(Wallet):
             "X-Api-Key": settings.lnpay_api_key,
             "User-Agent": settings.user_agent,
         }
-        self.client = httpx.AsyncClient(base_url=self.endpoint, headers=headers)
+        self.client = httpx.AsyncClient(
+            base_url=self.endpoint, headers=headers, limits=HTTP_CLIENT_LIMITS
+        )
+        self.statuses = {0: None, 1: True, -1: False}
 
     async def cleanup(self):
         try:
@@ -58,7 +62,7 @@ class LNPayWallet(Wallet):
             return StatusResponse(f"Unable to connect to '{url}'", 0)
 
         if r.is_error:
-            return StatusResponse(r.text[:250], 0)
+            return StatusResponse(r.content[:250].decode("utf-8", errors="replace"), 0)
 
         data = r.json()
         if data["statusType"]["name"] != "active":
@@ -78,7 +82,7 @@ class LNPayWallet(Wallet):
         unhashed_description: Optional[bytes] = None,
         **_,
     ) -> InvoiceResponse:
-        data: Dict = {"num_satoshis": f"{amount}"}
+        data: Dict = {"num_satoshis": str(amount)}
         if description_hash:
             data["description_hash"] = description_hash.hex()
         elif unhashed_description:
@@ -114,9 +118,8 @@ class LNPayWallet(Wallet):
         try:
             data = r.json()
         except Exception:
-            return PaymentResponse(
-                False, None, 0, None, f"Got invalid JSON: {r.text[:200]}"
-            )
+            body = r.content[:200].decode("utf-8", errors="replace")
+            return PaymentResponse(False, None, 0, None, f"Got invalid JSON: {body}")
 
         if r.is_error:
             return PaymentResponse(False, None, None, None, data["message"])
@@ -140,11 +143,10 @@ class LNPayWallet(Wallet):
         data = r.json()
         preimage = data["payment_preimage"]
         fee_msat = data["fee_msat"]
-        statuses = {0: None, 1: True, -1: False}
-        return PaymentStatus(statuses[data["settled"]], fee_msat, preimage)
+        return PaymentStatus(self.statuses[data["settled"]], fee_msat, preimage)
 
     async def paid_invoices_stream(self) -> AsyncGenerator[str, None]:
-        self.queue: asyncio.Queue = asyncio.Queue(0)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=1024)
         while settings.lnbits_running:
             value = await self.queue.get()
             yield value
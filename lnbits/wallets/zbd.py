@@ -9,6 +9,7 @@ from lnbits import bolt11
 from lnbits.settings import settings
 
 from .base import (
+    HTTP_CLIENT_LIMITS,
     InvoiceResponse,
     PaymentPendingStatus,
     PaymentResponse,
@@ -32,7 +33,24 @@ class ZBDWallet(Wallet):
             "apikey": settings.zbd_api_key,
             "User-Agent": settings.user_agent,
         }
-        self.client = httpx.AsyncClient(base_url=self.endpoint, headers=headers)
+        self.client = httpx.AsyncClient(
+            base_url=self.endpoint, headers=headers, limits=HTTP_CLIENT_LIMITS
+        )
+        self.invoice_statuses = {
+            "pending": None,
+            "paid": True,
+            "unpaid": None,
+            "expired": False,
+            "completed": True,
+        }
+        self.payment_statuses = {
+            "initial": None,
+            "pending": None,
+            "completed": True,
+            "error": None,
+            "expired": False,
+            "failed": False,
+        }
 
     async def cleanup(self):
         try:
@@ -65,9 +83,8 @@ class ZBDWallet(Wallet):
     ) -> InvoiceResponse:
         # https://api.zebedee.io/v0/charges
 
-        msats_amount = amount * 1000
         data: Dict = {
-            "amount": f"{msats_amount}",
+            "amount": str(amount * 1000),
             "expiresIn": 3600,
             "callbackUrl": "",
             "internalId": "",
@@ -118,7 +135,8 @@ class ZBDWallet(Wallet):
 
         data = r.json()
 
-        checking_id = bolt11.decode(bolt11_invoice).payment_hash
+        invoice = await asyncio.to_thread(bolt11.decode, bolt11_invoice)
+        checking_id = invoice.payment_hash
         fee_msat = -int(data["data"]["fee"])
         preimage = data["data"]["preimage"]
 
@@ -129,15 +147,7 @@ class ZBDWallet(Wallet):
         if r.is_error:
             return PaymentPendingStatus()
         data = r.json()["data"]
-
-        statuses = {
-            "pending": None,
-            "paid": True,
-            "unpaid": None,
-            "expired": False,
-            "completed": True,
-        }
-        return PaymentStatus(statuses[data.get("status")])
+        return PaymentStatus(self.invoice_statuses[data.get("status")])
 
     async def get_payment_status(self, checking_id: str) -> PaymentStatus:
         r = await self.client.get(f"payments/{checking_id}")
@@ -145,20 +155,12 @@ class ZBDWallet(Wallet):
             return PaymentPendingStatus()
 
         data = r.json()["data"]
-
-        statuses = {
-            "initial": None,
-            "pending": None,
-            "completed": True,
-            "error": None,
-            "expired": False,
-            "failed": False,
-        }
-
-        return PaymentStatus(statuses[data.get("status")], fee_msat=None, preimage=None)
+        return PaymentStatus(
+            self.payment_statuses[data.get("status")], fee_msat=None, preimage=None
+        )
 
     async def paid_invoices_stream(self) -> AsyncGenerator[str, None]:
-        self.queue: asyncio.Queue = asyncio.Queue(0)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=1024)
         while settings.lnbits_running:
             value = await self.queue.get()
             yield value
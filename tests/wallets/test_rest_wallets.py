@@ -1,13 +1,15 @@
+import asyncio
 import json
-from typing import Dict, Union
+from typing import Dict, List, Union
 from urllib.parse import urlencode
 
+import httpx
 import pytest
 from loguru import logger
 from pytest_httpserver import HTTPServer
 from werkzeug.wrappers import Response
 
-from tests.wallets.fixtures.models import Mock
+from tests.wallets.fixtures.models import FundingSourceConfig, Mock
 from tests.wallets.helpers import (
     WalletTest,
     build_test_id,
@@ -93,3 +95,91 @@ def _apply_mock(httpserver: HTTPServer, mock: Mock):
     respond_with = f"respond_with_{response_type}"
 
     getattr(req, respond_with)(server_response)
+
+
+def _sse_events(*payment_hashes: str, eol: bytes = b"\n") -> bytes:
+    return b"".join(
+        b"event: payment-received"
+        + eol
+        + b'data: {"payment_hash": "'
+        + payment_hash.encode()
+        + b'"}'
+        + eol
+        + eol
+        for payment_hash in payment_hashes
+    )
+
+
+_crlf_events = _sse_events("hash1", "hash2", eol=b"\r\n")
+_after_first_cr = _crlf_events.index(b"\r") + 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "chunks",
+    [
+        [_sse_events("hash1", "hash2")],
+        [_crlf_events],
+        [_sse_events("hash1", "hash2", eol=b"\r")],
+        [_crlf_events[:30], _crlf_events[30:]],
+        [_crlf_events[:_after_first_cr], _crlf_events[_after_first_cr:]],
+        [_crlf_events[i : i + 1] for i in range(len(_crlf_events))],
+        [
+            _sse_events("hash1")
+            + b": ping\n\n"
+            + b'event: other\ndata: {"payment_hash": "other"}\n\n'
+            + _sse_events("hash2")
+        ],
+        [
+            b"event: payment-received\ndata: not json\n\n"
+            + b'event: payment-received\ndata: {"checking_id": "x"}\n\n'
+            + b'event: payment-received\ndata: ["x"]\n\n'
+            + _sse_events("hash1", "hash2")
+        ],
+    ],
+    ids=[
+        "lf_events_in_one_chunk",
+        "crlf",
+        "cr",
+        "event_split_across_chunks",
+        "crlf_split_between_cr_and_lf",
+        "byte_at_a_time",
+        "ping_comment_between_events",
+        "invalid_data_is_skipped",
+    ],
+)
+async def test_lnbits_paid_invoices_stream(chunks: List[bytes]):
+    wallet = load_funding_source(
+        FundingSourceConfig(
+            name="lnbits",
+            wallet_class="LNbitsWallet",
+            settings={
+                "lnbits_endpoint": "http://127.0.0.1:8555",
+                "lnbits_admin_key": "f171ba022a764e679eef950b21fb1c04",
+            },
+        )
+    )
+
+    async def _stream():
+        for chunk in chunks:
+            yield chunk
+
+    wallet.client = httpx.AsyncClient(
+        base_url=wallet.endpoint,
+        transport=httpx.MockTransport(lambda _: httpx.Response(200, content=_stream())),
+    )
+
+    async def _collect(count: int) -> List[str]:
+        received: List[str] = []
+        paid_invoices = wallet.paid_invoices_stream()
+        async for payment_hash in paid_invoices:
+            received.append(payment_hash)
+            if len(received) == count:
+                break
+        await paid_invoices.aclose()
+        return received
+
+    try:
+        assert await asyncio.wait_for(_collect(2), timeout=5) == ["hash1", "hash2"]
+    finally:
+        await wallet.cleanup()